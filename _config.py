@@ -44,6 +44,8 @@ MONTE_CARLO_MODEL_TIME_HORIZON = 240
 MONTE_CARLO_MODEL_NUM_SIMULATIONS = 10000
 # Monte Carlo Model — Initial Bet Size
 MONTE_CARLO_MODEL_INITIAL_BET_SIZE = 100
+# Monte Carlo Model — Lookback (In days) of price history used to estimate volatility and drift
+MONTE_CARLO_MODEL_LOOKBACK_DAYS = 252
 
 # eToro API configuration
 ETORO_API_INSTRUMENTS_METADATA = "https://www.etoro.com/sapi/instrumentsmetadata/V1.1/instruments"
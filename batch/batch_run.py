@@ -7,7 +7,8 @@ multiprocessing for CPU-bound tasks and threading for concurrent I/O operations
 
 Key Features:
 - Asynchronous Task Polling: A background thread continuously polls a MongoDB database
-  for new 'pipeline' and 'ticker' tasks that require processing.
+  for new 'pipeline' and 'ticker' tasks that require processing. Where the deployment
+  supports change streams, watcher threads wake it as soon as a task becomes pending.
 - Parallel Execution: Utilizes a `ProcessPoolExecutor` to distribute and execute
   CPU-bound tasks (model functions) across multiple processes, maximizing CPU utilization.
 - Atomic Task Processing: Ensures that each task (ticker or pipeline) is processed
@@ -23,8 +24,13 @@ Key Features:
   termination or coordination of batch runs.
 
 Main Components:
+- `init_worker(worker_counter)`: Process pool initializer that makes each worker open its own
+  MongoDB client instead of reusing the one inherited from the parent process,
+  and preloads the model modules. Optionally pins the worker to one CPU.
 - `derive_module_and_func(model_function, model_name=None)`: Helper to determine the
   module and function name from model configuration.
+- `resolve_model_function(module_name, func_name)`: Cached import of a model function
+  together with its parameter names.
 - `process_ticker(doc)`: Worker function to process individual ticker documents. It
   dynamically loads and runs the specified model function for a given ticker.
 - `process_pipeline(doc)`: Worker function to process pipeline documents, similarly
@@ -38,7 +44,9 @@ This module is typically run as a standalone script:
 
 Configuration for `BATCH_SIZE`, `BATCH_TIMEOUT`, and `BATCH_PAUSE_IN_SECONDS`
 can be found in `_config.py`. Database connection details are loaded from environment
-variables (e.g., `.env` file).
+variables (e.g., `.env` file). Set `BATCH_TRACEMALLOC=true` to trace allocations and
+log the top allocation sites at the end of a run, and `BATCH_PIN_WORKERS=true` to pin
+each pool worker to its own CPU on Linux.
 
 Dependencies:
 - `pymongo`: For MongoDB interactions.
@@ -51,12 +59,19 @@ import sys
 import os
 import importlib
 import inspect
+import functools
+import contextlib
+import pkgutil
+import multiprocessing
 import threading
-import gc
 import tracemalloc
 import time
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
 from datetime import datetime, timedelta
-from queue import Queue
+from queue import Queue, Empty
 from concurrent.futures import ProcessPoolExecutor
 from pymongo.write_concern import WriteConcern
 from pymongo.read_concern import ReadConcern
@@ -74,8 +89,144 @@ MONGODB_DATABASE = os.getenv("MONGODB_DATABASE", "alphasentra-core")
 
 CHECK_INTERVAL = BATCH_PAUSE_IN_SECONDS
 
+# Allocation tracing slows every allocation in the runner and its forked workers,
+# so it is only enabled on request for memory diagnostics
+TRACEMALLOC_ENABLED = os.getenv("BATCH_TRACEMALLOC", "false").lower() == "true"
+
+# Pin each pool worker to a single CPU (Linux only). Off by default: most model runs
+# wait on network calls, where letting the scheduler place workers works better
+PIN_WORKERS = os.getenv("BATCH_PIN_WORKERS", "false").lower() == "true"
+
+# A ticker processed within this window is not picked up again
+TICKER_RETRY_DELAY = timedelta(minutes=5)
+
+# A running task refreshes its claimed_at this often, so a live claim never reaches its lease
+CLAIM_RENEW_INTERVAL = timedelta(seconds=30)
+# A claim not renewed for this long is treated as abandoned (e.g. the worker died) and can be
+# taken over; claims are released as soon as the task completes or fails
+TICKER_CLAIM_LEASE = timedelta(minutes=5)
+# Pipelines are often triggered on demand, so an abandoned claim is only held briefly
+PIPELINE_CLAIM_LEASE = timedelta(minutes=2)
+
+# Server error code for "$changeStream is only supported on replica sets"
+CHANGE_STREAMS_UNSUPPORTED = 40573
+# Upper bound for the delay before reopening a change stream that failed
+WATCH_MAX_BACKOFF_SECONDS = 60
+
+# Fields the workers read from polled task documents
+TICKER_TASK_PROJECTION = {"_id": 1, "ticker": 1, "model_function": 1, "model_name": 1,
+                          "prompt": 1, "factors": 1, "decimal": 1}
+PIPELINE_TASK_PROJECTION = {"_id": 1, "model_function": 1, "model_name": 1}
+
+# Optional arguments passed to ticker model functions that accept them
+MODEL_OPTIONAL_KWARGS = frozenset({"prompt", "factors", "batch_mode"})
+
 # --- HELPER FUNCTIONS ---
 
+def init_worker(worker_counter):
+    """
+    Process pool initializer: gives the worker its own MongoDB client, preloads
+    the models and, when BATCH_PIN_WORKERS is set, pins the worker to one CPU.
+
+    Args:
+        worker_counter: Shared multiprocessing.Value handing each worker its index
+    """
+    # MongoClient is not fork-safe; each worker opens its own connection pool
+    DatabaseManager().reset_client()
+    try:
+        DatabaseManager().get_client()
+    except Exception as e:
+        log_warning(f"Worker could not connect to MongoDB yet: {e}", "WORKER_INIT")
+
+    # Import every model module up front so a worker's first task does not pay for it.
+    # Done here rather than in the parent, since model clients must not be created before fork.
+    for module_info in pkgutil.iter_modules(importlib.import_module("models").__path__):
+        try:
+            importlib.import_module(f"models.{module_info.name}")
+        except Exception as e:
+            log_warning(f"Could not preload models.{module_info.name}: {e}", "WORKER_INIT")
+
+    if PIN_WORKERS and hasattr(os, "sched_setaffinity"):
+        try:
+            # Spread workers round-robin over the allowed CPUs, in the order they start
+            with worker_counter.get_lock():
+                worker_index = worker_counter.value
+                worker_counter.value += 1
+            cpus = sorted(os.sched_getaffinity(0))
+            os.sched_setaffinity(0, {cpus[worker_index % len(cpus)]})
+        except Exception as e:
+            log_warning(f"Could not pin worker to a CPU: {e}", "WORKER_INIT")
+
+def log_memory_usage():
+    """Logs the runner's peak RSS and, when tracing is enabled, its top allocation sites."""
+    if resource is not None:
+        # ru_maxrss is reported in kilobytes on Linux
+        peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        log_info(f"Batch runner peak RSS: {peak_rss_mb:.1f} MB")
+
+    if tracemalloc.is_tracing():
+        for stat in tracemalloc.take_snapshot().statistics("lineno")[:10]:
+            log_info(f"Allocation: {stat}")
+
+def retry_due(now):
+    """Returns the $or clauses matching tickers never processed or last processed before the retry window."""
+    return [
+        {"last_processed": {"$exists": False}},
+        {"last_processed": {"$lt": now - TICKER_RETRY_DELAY}}
+    ]
+
+def pending_change_filter(pending_field):
+    """Returns a change-stream pipeline matching documents that become pending on `pending_field`."""
+    return [{"$match": {"$or": [
+        {"operationType": {"$in": ["insert", "replace"]}, f"fullDocument.{pending_field}": False},
+        {"operationType": "update", f"updateDescription.updatedFields.{pending_field}": False}
+    ]}}]
+
+def claim_expired(now, lease):
+    """Returns the $or clauses matching tasks that are unclaimed or whose claim is older than `lease`."""
+    return [
+        {"claimed_at": {"$exists": False}},
+        {"claimed_at": {"$lt": now - lease}}
+    ]
+
+def task_collection(collection_name):
+    """Returns a task collection from the current client; models may close the worker's client mid-task."""
+    return DatabaseManager().get_client()[MONGODB_DATABASE].get_collection(collection_name)
+
+def release_claim(collection_name, doc_id):
+    """Clears the claim on a task that did not complete, so the next poll can pick it up again."""
+    try:
+        task_collection(collection_name).update_one({"_id": doc_id}, {"$unset": {"claimed_at": ""}})
+    except Exception as e:
+        log_warning(f"Could not release claim on {doc_id}: {e}", "CLAIM_RELEASE")
+
+@contextlib.contextmanager
+def renewed_claim(collection_name, doc_id):
+    """
+    Refreshes claimed_at every CLAIM_RENEW_INTERVAL while the block runs, so a task
+    that runs longer than its lease is not taken over by another runner.
+    """
+    stop = threading.Event()
+
+    def renew():
+        while not stop.wait(CLAIM_RENEW_INTERVAL.total_seconds()):
+            try:
+                task_collection(collection_name).update_one(
+                    {"_id": doc_id, "claimed_at": {"$exists": True}},
+                    {"$set": {"claimed_at": datetime.now()}}
+                )
+            except Exception as e:
+                log_warning(f"Could not renew claim on {doc_id}: {e}", "CLAIM_RENEW")
+
+    renewer = threading.Thread(target=renew, daemon=True)
+    renewer.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        renewer.join()
+
+@functools.lru_cache(maxsize=None)
 def derive_module_and_func(model_function, model_name=None):
     func_name = model_function
     if model_name:
@@ -84,80 +235,103 @@ def derive_module_and_func(model_function, model_name=None):
     base = model_function.replace("run_", "").replace("_model", "")
     return base, func_name
 
+@functools.lru_cache(maxsize=None)
+def resolve_model_function(module_name, func_name):
+    """Imports a model function once per worker and returns it with the argument names it accepts."""
+    module = importlib.import_module(f"models.{module_name}")
+    func = getattr(module, func_name)
+    parameters = inspect.signature(func).parameters
+    accepted = frozenset(parameters)
+    # A model taking **kwargs accepts every optional argument the runner passes
+    if any(param.kind is inspect.Parameter.VAR_KEYWORD for param in parameters.values()):
+        accepted |= MODEL_OPTIONAL_KWARGS
+    return func, accepted
+
 def process_ticker(doc):
-    """Atomic worker for individual tickers."""
+    """Atomic worker for individual tickers. Returns True on success; the runner marks it generated."""
+    claimed = None
     try:
         client = DatabaseManager().get_client()
         db = client[MONGODB_DATABASE]
         tickers_coll = db.get_collection('tickers')
 
-        # Atomic check: only process if not already done
-        current = tickers_coll.find_one({"_id": doc["_id"], "document_generated": False})
-        if not current: return False
+        # Atomic claim: only process if not already done and not claimed by another runner;
+        # stamping claimed_at hides it from every poller until it is released or the lease ends
+        now = datetime.now()
+        claimed = tickers_coll.find_one_and_update(
+            {"_id": doc["_id"], "document_generated": False, "$or": claim_expired(now, TICKER_CLAIM_LEASE)},
+            {"$set": {"claimed_at": now}},
+            projection={"_id": 1}
+        )
+        if not claimed: return False
 
         module_info = derive_module_and_func(doc.get("model_function"), doc.get("model_name"))
-        if not module_info: return False
+        if not module_info:
+            release_claim('tickers', doc["_id"])
+            return False
         
         module_name, func_name = module_info
-        module = importlib.import_module(f"models.{module_name}")
-        func = getattr(module, func_name)
+        func, params = resolve_model_function(module_name, func_name)
         
-        sig = inspect.signature(func)
         kwargs = {'tickers': [doc["ticker"]], 'decimal_digits': doc.get("decimal", 2)}
-        if 'prompt' in sig.parameters: kwargs['prompt'] = doc.get("prompt")
-        if 'factors' in sig.parameters: kwargs['factors'] = doc.get("factors")
-        if 'batch_mode' in sig.parameters: kwargs['batch_mode'] = True
+        optional_kwargs = {'prompt': doc.get("prompt"), 'factors': doc.get("factors"), 'batch_mode': True}
+        kwargs.update((key, value) for key, value in optional_kwargs.items() if key in params)
         
-        func(**kwargs)
+        with renewed_claim('tickers', doc["_id"]):
+            func(**kwargs)
         
-        # Safe update with WriteConcern
-        wc_coll = tickers_coll.with_options(write_concern=WriteConcern(w="majority", j=True))
-        wc_coll.update_one(
-            {"_id": doc["_id"], "document_generated": False},
-            {"$set": {"document_generated": True, "last_processed": datetime.now()}}
-        )
+        # document_generated is written by the runner in a single bulk write per flush
         return True
     except Exception as e:
         log_error(f"Ticker {doc.get('ticker')} failed", "TICKER_ERR", e)
+        if claimed: release_claim('tickers', doc["_id"])
         update_ticker_fail_status(doc.get('ticker'))
         return False
 
 def process_pipeline(doc):
-    """Atomic worker for pipelines."""
+    """Atomic worker for pipelines. Returns True on success; the runner marks it completed."""
+    claimed = None
     try:
         client = DatabaseManager().get_client()
         db = client[MONGODB_DATABASE]
         pipelines_coll = db.get_collection('pipeline')
 
-        current = pipelines_coll.find_one({"_id": doc["_id"], "task_completed": False})
-        if not current: return False
+        # Atomic claim, as for tickers: stamping claimed_at hides it from every poller
+        now = datetime.now()
+        claimed = pipelines_coll.find_one_and_update(
+            {"_id": doc["_id"], "task_completed": False, "$or": claim_expired(now, PIPELINE_CLAIM_LEASE)},
+            {"$set": {"claimed_at": now}},
+            projection={"_id": 1}
+        )
+        if not claimed: return False
 
         module_info = derive_module_and_func(doc.get("model_function"), doc.get("model_name"))
-        if not module_info: return False
+        if not module_info:
+            release_claim('pipeline', doc["_id"])
+            return False
         
         module_name, func_name = module_info
         try:
-            module = importlib.import_module(f"models.{module_name}")
-            func = getattr(module, func_name)
-        except:
-            module = importlib.import_module("models.default")
-            func = getattr(module, func_name)
+            func, params = resolve_model_function(module_name, func_name)
+        except Exception:
+            func, params = resolve_model_function("default", func_name)
         
-        sig = inspect.signature(func)
-        kwargs = {'batch_mode': True} if 'batch_mode' in sig.parameters else {}
-        func(**kwargs)
+        kwargs = {'batch_mode': True} if 'batch_mode' in params else {}
+        with renewed_claim('pipeline', doc["_id"]):
+            func(**kwargs)
         
-        wc_coll = pipelines_coll.with_options(write_concern=WriteConcern(w="majority", j=True))
-        wc_coll.update_one({"_id": doc["_id"]}, {"$set": {"task_completed": True}})
+        # Completion is written by the runner in a single bulk write per flush
         return True
     except Exception as e:
         log_error(f"Pipeline {doc.get('model_function')} failed", "PIPE_ERR", e)
+        if claimed: release_claim('pipeline', doc["_id"])
         return False
 
 # --- MAIN RUNNER ---
 
 def run_batch_processing(max_workers=BATCH_SIZE):
-    tracemalloc.start()
+    if TRACEMALLOC_ENABLED:
+        tracemalloc.start()
     log_info(f"Starting Async-Parallel Runner. Max Workers: {max_workers}")
 
     client = DatabaseManager().get_client()
@@ -177,6 +351,8 @@ def run_batch_processing(max_workers=BATCH_SIZE):
 
     work_queue = Queue()
     stop_event = threading.Event()
+    # Set by the change-stream watchers so the poller runs before CHECK_INTERVAL elapses
+    wake_event = threading.Event()
 
     # Tracking and Concurrency Control
     queued_ids = set()
@@ -187,53 +363,142 @@ def run_batch_processing(max_workers=BATCH_SIZE):
         """Background thread: Continuously fills the queue with individual tasks."""
         client = DatabaseManager().get_client()
         db = client[MONGODB_DATABASE]
+        pipe_coll = db.get_collection('pipeline', read_concern=ReadConcern("majority"))
+        tick_coll = db.get_collection('tickers', read_concern=ReadConcern("majority"))
+
+        def enqueue(work_type, cursor):
+            # Hand each document to the dispatcher as soon as the cursor yields it
+            for doc in cursor:
+                with ids_lock:
+                    if doc["_id"] in queued_ids:
+                        continue
+                    queued_ids.add(doc["_id"])
+                work_queue.put((work_type, doc))
 
         while not stop_event.is_set():
             try:
-                # Poll Pipelines (Priority)
-                pipe_coll = db.get_collection('pipeline', read_concern=ReadConcern("majority"))
-                new_pipes = list(pipe_coll.find({"task_completed": False}).limit(10))
-
+                # Skip documents that are already queued or running, so each poll
+                # only transfers tasks that are actually new
                 with ids_lock:
-                    for p in new_pipes:
-                        if p["_id"] not in queued_ids:
-                            queued_ids.add(p["_id"])
-                            work_queue.put(('pipeline', p))
+                    in_flight_ids = list(queued_ids)
 
-                # Poll Tickers
-                tick_coll = db.get_collection('tickers', read_concern=ReadConcern("majority"))
-                new_ticks = list(tick_coll.find({
-                    "document_generated": False,
-                    "recurrence": {"$ne": "processed"},
-                    "$or": [
-                        {"last_processed": {"$exists": False}},
-                        {"last_processed": {"$lt": datetime.now() - timedelta(minutes=5)}}
-                    ]
-                }).limit(BATCH_SIZE))
+                # Backpressure: fetch no more than the free worker slots, so the queue
+                # never runs ahead of the pool (a limit of 0 would mean no limit)
+                capacity = max_workers - len(in_flight_ids)
 
-                with ids_lock:
-                    for t in new_ticks:
-                        if t["_id"] not in queued_ids:
-                            queued_ids.add(t["_id"])
-                            work_queue.put(('ticker', t))
+                # Poll Pipelines (Priority)
+                if capacity > 0:
+                    enqueue('pipeline', pipe_coll.find({
+                        "task_completed": False,
+                        "_id": {"$nin": in_flight_ids},
+                        "$or": claim_expired(datetime.now(), PIPELINE_CLAIM_LEASE)
+                    }, PIPELINE_TASK_PROJECTION).limit(min(10, capacity)).batch_size(10))
 
-                time.sleep(CHECK_INTERVAL)
+                    with ids_lock:
+                        in_flight_ids = list(queued_ids)
+                    capacity = max_workers - len(in_flight_ids)
+
+                # Poll Tickers
+                if capacity > 0:
+                    now = datetime.now()
+                    ticker_limit = min(BATCH_SIZE, capacity)
+                    enqueue('ticker', tick_coll.find({
+                        "document_generated": False,
+                        "_id": {"$nin": in_flight_ids},
+                        "recurrence": {"$ne": "processed"},
+                        "$and": [
+                            {"$or": retry_due(now)},
+                            {"$or": claim_expired(now, TICKER_CLAIM_LEASE)}
+                        ]
+                    }, TICKER_TASK_PROJECTION).limit(ticker_limit).batch_size(ticker_limit))
+
+                # Timed wait that returns early when a watcher sees a new task or the run stops
+                wake_event.wait(CHECK_INTERVAL)
+                wake_event.clear()
             except Exception as e:
                 log_error("Poller encountered an error", "POLL_ERR", e)
-                time.sleep(10)
+                stop_event.wait(10)
+
+    def watch_new_items(collection_name, pending_field):
+        """Background thread: Wakes the poller when a task becomes pending in the collection."""
+        coll = db.get_collection(collection_name)
+        backoff = 1
+        while not stop_event.is_set():
+            try:
+                with coll.watch(pending_change_filter(pending_field), max_await_time_ms=1000) as stream:
+                    backoff = 1
+                    while not stop_event.is_set():
+                        if stream.try_next() is not None:
+                            wake_event.set()
+            except pymongo.errors.OperationFailure as e:
+                # Change streams need a replica set; interval polling still picks everything up
+                if e.code == CHANGE_STREAMS_UNSUPPORTED:
+                    log_warning(f"Change streams unsupported by this deployment, polling {collection_name} every {CHECK_INTERVAL}s", "WATCH")
+                    return
+                log_warning(f"Change stream on {collection_name} failed, reopening in {backoff}s: {e}", "WATCH")
+            except pymongo.errors.PyMongoError as e:
+                # Elections and network blips end the stream; polling covers the gap until it reopens
+                log_warning(f"Change stream on {collection_name} interrupted, reopening in {backoff}s: {e}", "WATCH")
+            stop_event.wait(backoff)
+            backoff = min(backoff * 2, WATCH_MAX_BACKOFF_SECONDS)
 
     # Start Poller
     poller_thread = threading.Thread(target=poll_new_items, daemon=True)
     poller_thread.start()
 
+    # Start Watchers
+    for collection_name, pending_field in (('pipeline', 'task_completed'), ('tickers', 'document_generated')):
+        threading.Thread(target=watch_new_items, args=(collection_name, pending_field), daemon=True).start()
+
+    # Finished tasks whose completion flag still has to be written, per work type
+    completion_wc = WriteConcern(w="majority", j=True)
+    completion_colls = {
+        'pipeline': db.get_collection('pipeline').with_options(write_concern=completion_wc),
+        'ticker': db.get_collection('tickers').with_options(write_concern=completion_wc),
+    }
+    completed_tasks = {'pipeline': [], 'ticker': []}
+
+    def completion_update(work_type, doc_id, finished_at):
+        if work_type == 'pipeline':
+            return pymongo.UpdateOne({"_id": doc_id}, {"$set": {"task_completed": True}, "$unset": {"claimed_at": ""}})
+        return pymongo.UpdateOne(
+            {"_id": doc_id, "document_generated": False},
+            {"$set": {"document_generated": True, "last_processed": finished_at}, "$unset": {"claimed_at": ""}}
+        )
+
+    def flush_completed_tasks():
+        """Marks every finished task as completed with one bulk write per collection."""
+        for work_type, completed in completed_tasks.items():
+            with ids_lock:
+                if not completed:
+                    continue
+                done = completed[:]
+                completed.clear()
+            try:
+                completion_colls[work_type].bulk_write(
+                    [completion_update(work_type, doc_id, finished_at) for doc_id, finished_at in done],
+                    ordered=False
+                )
+            except Exception as e:
+                log_error(f"Failed to mark {work_type} tasks as completed", "COMPLETION_ERR", e)
+            finally:
+                with ids_lock:
+                    queued_ids.difference_update(doc_id for doc_id, _ in done)
+
     # Shared callback to release slots and clear tracking
-    def task_done_callback(future, doc_id):
+    def task_done_callback(future, doc_id, work_type):
         semaphore.release()
+        succeeded = not future.cancelled() and future.exception() is None and future.result()
         with ids_lock:
-            queued_ids.discard(doc_id)
+            if succeeded:
+                # Stays tracked as queued until its completion has been written
+                completed_tasks[work_type].append((doc_id, datetime.now()))
+            else:
+                queued_ids.discard(doc_id)
 
     # Use a persistent Process Pool
-    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker,
+                             initargs=(multiprocessing.Value('i', 0),)) as executor:
         start_time = time.time()
         last_db_batch_id_check_time = time.time() # Initialize check time
 
@@ -248,27 +513,25 @@ def run_batch_processing(max_workers=BATCH_SIZE):
                 last_db_batch_id_check_time = time.time()
 
             try:
-                # Get the next single task from the queue
-                if not work_queue.empty():
-                    work_type, doc = work_queue.get()
+                flush_completed_tasks()
 
-                    # 1. Acquire a slot (blocks only this loop, not the poller)
-                    semaphore.acquire()
+                # Wait for the next single task; the timeout keeps the flush and
+                # batch_id checks running while the queue is empty
+                try:
+                    work_type, doc = work_queue.get(timeout=1)
+                except Empty:
+                    continue
 
-                    # 2. Assign to worker
-                    worker_func = process_pipeline if work_type == 'pipeline' else process_ticker
-                    future = executor.submit(worker_func, doc)
+                # 1. Acquire a slot (blocks only this loop, not the poller)
+                semaphore.acquire()
 
-                    # 3. Non-blocking cleanup when finished
-                    future.add_done_callback(lambda f, d=doc["_id"]: task_done_callback(f, d))
-                    work_queue.task_done()
-                else:
-                    # Nothing to do? Wait a moment.
-                    time.sleep(1)
+                # 2. Assign to worker
+                worker_func = process_pipeline if work_type == 'pipeline' else process_ticker
+                future = executor.submit(worker_func, doc)
 
-                # Periodic Garbage Collection
-                if int(time.time() - start_time) % 300 == 0:
-                    gc.collect()
+                # 3. Non-blocking cleanup when finished
+                future.add_done_callback(lambda f, d=doc["_id"], w=work_type: task_done_callback(f, d, w))
+                work_queue.task_done()
 
             except KeyboardInterrupt:
                 log_info("Shutdown signal received.")
@@ -277,6 +540,14 @@ def run_batch_processing(max_workers=BATCH_SIZE):
             except Exception as e:
                 log_error("Main loop error", "MAIN_LOOP_ERR", e)
 
+    # Stop the poller and watchers before the final flush
+    stop_event.set()
+    wake_event.set()
+
+    # Tasks that finished while the pool was shutting down
+    flush_completed_tasks()
+
+    log_memory_usage()
     log_info("Batch processing finished.")
 
 if __name__ == "__main__":
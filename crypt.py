@@ -4,6 +4,7 @@ Utility functions for encrypting and decrypting strings using a secret key from
 """
 import base64
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
@@ -23,6 +24,39 @@ CONTENT_TO_ENCRYPT = """
 #To decrypt string, paste the encrypted content below into ENCRYPTED_CONTENT and run this script. The decrypted result will be printed out.
 ENCRYPTED_CONTENT = ''
 
+
+@lru_cache(maxsize=8)
+def _get_fernet(secret_key):
+    """
+    Build the Fernet instance for a secret key.
+
+    The PBKDF2 derivation (100,000 iterations) is the expensive part of every
+    encrypt/decrypt call, so the result is cached per secret key.
+    """
+    # Derive a 32-byte key from the secret using PBKDF2
+    salt = b'AlphagoraSalt_'  # Fixed salt for simplicity (in production, use random salt)
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=salt,
+        iterations=100000,
+    )
+    key = base64.urlsafe_b64encode(kdf.derive(secret_key.encode()))
+    return Fernet(key)
+
+
+@lru_cache(maxsize=64)
+def _decrypt_cached(encrypted_text, secret_key):
+    """
+    Decrypt an encrypted string, caching the plaintext.
+
+    The encrypted prompts in _config.py are constants that get decrypted on every
+    model run, so each one only needs to be decrypted once per process.
+    Failures raise and are therefore never cached.
+    """
+    return _get_fernet(secret_key).decrypt(encrypted_text.encode()).decode()
+
+
 def encrypt_string(plaintext, secret_key=None):
     """
     Encrypt a string using a secret key from environment variables.
@@ -42,18 +76,8 @@ def encrypt_string(plaintext, secret_key=None):
             if not secret_key:
                 raise ValueError("ENCRYPTION_SECRET not found in environment variables")
         
-        # Derive a 32-byte key from the secret using PBKDF2
-        salt = b'AlphagoraSalt_'  # Fixed salt for simplicity (in production, use random salt)
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-        )
-        key = base64.urlsafe_b64encode(kdf.derive(secret_key.encode()))
-        
-        # Create Fernet instance with the derived key
-        fernet = Fernet(key)
+        # Fernet instance with the derived key (cached per secret key)
+        fernet = _get_fernet(secret_key)
         
         # Encrypt the plaintext
         encrypted = fernet.encrypt(plaintext.encode())
@@ -89,23 +113,8 @@ def decrypt_string(encrypted_text, secret_key=None):
             if not secret_key:
                 raise ValueError("ENCRYPTION_SECRET not found in environment variables")
 
-        # Derive a 32-byte key from the secret using PBKDF2
-        salt = b'AlphagoraSalt_'  # Fixed salt for simplicity (in production, use random salt)
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-        )
-        key = base64.urlsafe_b64encode(kdf.derive(secret_key.encode()))
-
-        # Create Fernet instance with the derived key
-        fernet = Fernet(key)
-
-        # Decrypt the encrypted text
-        decrypted = fernet.decrypt(encrypted_text.encode())
-
-        return decrypted.decode()
+        # Decrypt the encrypted text (cached per encrypted text and secret key)
+        return _decrypt_cached(encrypted_text, secret_key)
 
     except ImportError:
         # Fallback to simple decryption if cryptography is not available
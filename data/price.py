@@ -42,14 +42,191 @@ This project uses the following third-party libraries:
 """
 
 
+import time
 import yfinance as yf
-import backtrader as bt
-from backtrader.indicators import ATR, ADX
 from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
 from logging_utils import log_error, log_warning, log_info
 from typing import Optional
 
+# Accepted values for trade_direction
+TRADE_DIRECTIONS = frozenset({"LONG", "SHORT"})
+
+# Calendar days of daily OHLC history used for trade levels and entry prices
+PRICE_HISTORY_DAYS = 60
+
+# Daily OHLC downloads are reused within this window so that the trade level and
+# entry price calculations for the same ticker do not hit Yahoo Finance repeatedly
+PRICE_HISTORY_CACHE_TTL_SECONDS = 300
+PRICE_HISTORY_CACHE_MAX_ENTRIES = 128
+_price_history_cache = {}
+
+
+def _download_daily_history(ticker, days):
+    """
+    Download daily OHLC data for the last `days` calendar days, reusing a recent
+    download of the same window when one is available.
+
+    Parameters:
+    ticker (str): Ticker symbol
+    days (int): Number of calendar days to look back
+
+    Returns:
+    pd.DataFrame: Daily OHLC data (empty if nothing was returned)
+    """
+    key = (ticker, days)
+    now = time.time()
+    cached = _price_history_cache.get(key)
+    if cached is not None and now - cached[0] < PRICE_HISTORY_CACHE_TTL_SECONDS:
+        return cached[1]
+
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=days)
+    data = yf.download(ticker, start=start_date, end=end_date, progress=False, multi_level_index=False, auto_adjust=False)
+
+    if not data.empty:
+        if len(_price_history_cache) >= PRICE_HISTORY_CACHE_MAX_ENTRIES:
+            _price_history_cache.clear()
+        _price_history_cache[key] = (now, data)
+    return data
+
+
+def _prefetch_daily_history(tickers, days):
+    """
+    Download daily OHLC data for several tickers in one batched request so that
+    the per-ticker loops that follow are served from the cache.
+
+    A single yf.download call is used because yfinance keeps download results in
+    a module-global dict that concurrent yf.download calls overwrite.
+
+    Parameters:
+    tickers (list): List of ticker symbols as strings
+    days (int): Number of calendar days to look back
+    """
+    now = time.time()
+    pending = [
+        ticker for ticker in dict.fromkeys(tickers)
+        if (ticker, days) not in _price_history_cache
+        or now - _price_history_cache[(ticker, days)][0] >= PRICE_HISTORY_CACHE_TTL_SECONDS
+    ]
+    if len(pending) < 2:
+        return
+
+    try:
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=days)
+        data = yf.download(pending, start=start_date, end=end_date, group_by='ticker', threads=True,
+                           progress=False, auto_adjust=False)
+
+        for ticker in pending:
+            if ticker not in data.columns.get_level_values(0):
+                continue
+            # Rows are aligned across tickers; drop the dates this ticker did not trade
+            ticker_data = data[ticker].dropna(how='all')
+            if ticker_data.empty:
+                continue
+            if len(_price_history_cache) >= PRICE_HISTORY_CACHE_MAX_ENTRIES:
+                _price_history_cache.clear()
+            _price_history_cache[(ticker, days)] = (now, ticker_data)
+    except Exception as e:
+        # The per-ticker loops download (and report) anything that failed here
+        log_warning(f"Batched price history download failed: {e}", "PRICE_HISTORY_PREFETCH")
+
+
+def _entry_price_from_history(data, trade_direction, period=5):
+    """
+    Entry price from already downloaded daily data: the high of the last `period`
+    bars for LONG positions, the low for SHORT positions.
+
+    Parameters:
+    data (pd.DataFrame): Daily OHLC data
+    trade_direction (str): Trade direction, either "LONG" or "SHORT"
+    period (int): Number of trailing bars to use (default: 5 for one week)
+
+    Returns:
+    float: Entry price, or None if there are fewer than `period` bars
+    """
+    week_data = data.tail(period)
+    if len(week_data) < period:
+        return None
+
+    if trade_direction == "LONG":
+        entry_price = week_data['High'].max()
+    else:  # SHORT
+        entry_price = week_data['Low'].min()
+    return float(max(0, entry_price))  # Ensure non-negative
+
+
+def _wilder_smoothing(values, period):
+    """
+    Wilder's smoothed moving average, seeded with the simple average of the first
+    `period` values (same convention as backtrader's SmoothedMovingAverage).
+
+    Parameters:
+    values (np.ndarray): Input series
+    period (int): Smoothing period
+
+    Returns:
+    np.ndarray: Smoothed series, starting at the first complete window
+    """
+    if len(values) < period:
+        raise ValueError(f"At least {period} values are required, got {len(values)}")
+    smoothed = np.empty(len(values) - period + 1)
+    average = float(values[:period].mean())
+    smoothed[0] = average
+    # The series here are a few dozen bars long, so a plain scalar recurrence is
+    # cheaper than building a pandas Series just to call ewm()
+    for i, value in enumerate(values[period:].tolist(), start=1):
+        average += (value - average) / period
+        smoothed[i] = average
+    return smoothed
+
+
+def _average_true_range(high, low, close, period=14):
+    """
+    Average True Range computed on NumPy arrays.
+
+    Parameters:
+    high (np.ndarray): High prices
+    low (np.ndarray): Low prices
+    close (np.ndarray): Close prices
+    period (int): ATR period (default: 14)
+
+    Returns:
+    np.ndarray: ATR series, starting at the first complete window
+    """
+    prev_close = close[:-1]
+    true_range = np.maximum(high[1:], prev_close) - np.minimum(low[1:], prev_close)
+    return _wilder_smoothing(true_range, period)
+
+
+def _average_directional_index(high, low, close, period=14):
+    """
+    Average Directional Index computed on NumPy arrays (Wilder's definition,
+    matching backtrader's ADX indicator).
+
+    Parameters:
+    high (np.ndarray): High prices
+    low (np.ndarray): Low prices
+    close (np.ndarray): Close prices
+    period (int): ADX period (default: 14)
+
+    Returns:
+    np.ndarray: ADX series, starting at the first complete window
+    """
+    up_move = high[1:] - high[:-1]
+    down_move = low[:-1] - low[1:]
+    plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+    minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+
+    atr = _average_true_range(high, low, close, period)
+    plus_di = 100.0 * _wilder_smoothing(plus_dm, period) / atr
+    minus_di = 100.0 * _wilder_smoothing(minus_dm, period) / atr
+    dx = 100.0 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+    return _wilder_smoothing(dx, period)
+
+
 def calculate_trade_levels(tickers, trade_direction, period=14, decimal_digits=2):
     """
     Calculate appropriate stop loss and target price levels based on ADX and ATR indicators.
@@ -66,7 +243,7 @@ def calculate_trade_levels(tickers, trade_direction, period=14, decimal_digits=2
     
     try:
         # Validate trade direction
-        if trade_direction not in ["LONG", "SHORT"]:
+        if trade_direction not in TRADE_DIRECTIONS:
             raise ValueError("Trade direction must be either 'LONG' or 'SHORT'")
         
         # Dictionary to store stop loss prices
@@ -75,48 +252,24 @@ def calculate_trade_levels(tickers, trade_direction, period=14, decimal_digits=2
         log_info("Calculating stop loss prices...")
 
         # Fetch data for all tickers
+        _prefetch_daily_history(tickers, PRICE_HISTORY_DAYS)
         for ticker in tickers:
             try:
                 # Fetch historical data for the last 60 days
-                end_date = datetime.now()
-                start_date = end_date - timedelta(days=60)
-                data = yf.download(ticker, start=start_date, end=end_date, progress=False, multi_level_index=False, auto_adjust=False)
+                data = _download_daily_history(ticker, PRICE_HISTORY_DAYS)
                 
                 if data.empty:
                     log_error(f"No data available for {ticker}")
                     continue
                 
-                # Prepare data for backtrader
-                data_feed = bt.feeds.PandasData(dataname=data)
-                
-                # Create a cerebro instance
-                cerebro = bt.Cerebro()
-                
-                # Add data to cerebro
-                cerebro.adddata(data_feed)
-                
-                # Create a strategy to calculate indicators
-                class IndicatorStrategy(bt.Strategy):
-                    def __init__(self):
-                        self.atr = ATR(period=period)
-                        self.adx = ADX(period=period)
-                    
-                    def next(self):
-                        pass  # We don't need to do anything in next()
-                
-                # Add strategy to cerebro
-                cerebro.addstrategy(IndicatorStrategy)
-                
-                # Run cerebro to calculate indicators
-                results = cerebro.run()
-                
-                # Get the strategy instance
-                strategy = results[0]
+                high = data['High'].to_numpy(dtype=float)
+                low = data['Low'].to_numpy(dtype=float)
+                close = data['Close'].to_numpy(dtype=float)
                 
                 # Get the latest values of indicators
-                current_atr = strategy.atr[0]
-                current_adx = strategy.adx[0]
-                current_close = data['Close'].iloc[-1]
+                current_atr = _average_true_range(high, low, close, period)[-1]
+                current_adx = _average_directional_index(high, low, close, period)[-1]
+                current_close = close[-1]
                 
                 # Calculate stop loss based on ADX strength and ATR
                 # Higher ADX means stronger trend, so we can place stop loss further away
@@ -140,9 +293,10 @@ def calculate_trade_levels(tickers, trade_direction, period=14, decimal_digits=2
                 else:  # SHORT
                     stop_loss_price = current_close + stop_loss_distance
                 
-                # Calculate entry price for this ticker
-                entry_prices = calculate_entry_price([ticker], trade_direction)
-                entry_price = entry_prices.get(ticker, current_close)  # Fallback to current close if entry price calculation fails
+                # Calculate entry price for this ticker from the same download
+                entry_price = _entry_price_from_history(data, trade_direction)
+                if entry_price is None:
+                    entry_price = current_close  # Fallback to current close if entry price calculation fails
                 
                 # Calculate target price for consistent 1:2.5 risk-reward ratio
                 # Use actual risk distance (entry to stop loss) rather than ATR-based distance
@@ -187,7 +341,7 @@ def calculate_entry_price(tickers, trade_direction, period=5):
     
     try:
         # Validate trade direction
-        if trade_direction not in ["LONG", "SHORT"]:
+        if trade_direction not in TRADE_DIRECTIONS:
             raise ValueError("Trade direction must be either 'LONG' or 'SHORT'")
         
         # Dictionary to store entry prices
@@ -196,40 +350,25 @@ def calculate_entry_price(tickers, trade_direction, period=5):
         log_info("Calculating entry prices...")
 
         # Fetch data for all tickers
+        _prefetch_daily_history(tickers, PRICE_HISTORY_DAYS)
         for ticker in tickers:
             try:
-                # Fetch historical data for the last 30 days (to ensure we have enough data for weekly calculations)
-                end_date = datetime.now()
-                start_date = end_date - timedelta(days=30)
-                data = yf.download(ticker, start=start_date, end=end_date, progress=False, multi_level_index=False, auto_adjust=False)
+                # Use the same window as calculate_trade_levels so both share one download
+                data = _download_daily_history(ticker, PRICE_HISTORY_DAYS)
                 
                 if data.empty:
                     log_error(f"No data available for {ticker}", "ENTRY_PRICE_CALCULATION")
                     continue
                 
-                # Get data for the past week only (last 5 trading days)
-                week_data = data.tail(period)
+                # For LONG positions, entry price is at the high since past week to now
+                # For SHORT positions, entry price is at the low since past week to now
+                entry_price = _entry_price_from_history(data, trade_direction, period)
                 
-                if len(week_data) < period:
+                if entry_price is None:
                     log_warning(f"Not enough data for {ticker} to calculate weekly high/low", "ENTRY_PRICE_CALCULATION")
                     continue
                 
-                # Calculate weekly high and low
-                week_high = week_data['High'].max()
-                week_low = week_data['Low'].min()
-                
-                # Calculate entry price based on trade direction
-                # For LONG positions, entry price is at the high since past week to now
-                # For SHORT positions, entry price is at the low since past week to now
-                if trade_direction == "LONG":
-                    # Enter at the high since past week to now
-                    entry_price = week_high
-                else:  # SHORT
-                    # Enter at the low since past week to now
-                    entry_price = week_low
-                
-                # Store the result as Python float
-                entry_prices[ticker] = float(max(0, entry_price))  # Ensure non-negative
+                entry_prices[ticker] = entry_price
                 
                 
             except Exception as e:
@@ -317,25 +456,32 @@ def calculate_performance_metrics(ticker):
         
         performance = {}
         
+        # Fetch the longest window once and slice the shorter periods out of it
+        try:
+            hist = stock.history(start=periods['1y'], end=end_date, interval="1d")
+        except Exception as e:
+            log_warning(f"Could not fetch price history for {ticker}: {e}", "PERFORMANCE_METRICS_CALCULATION")
+            hist = pd.DataFrame()
+        
+        if hist.empty:
+            return {**{period: 0.0 for period in periods}, '1d': 0.0}
+        
+        closes = hist['Close'].to_numpy(dtype=float)
+        # Session dates (exchange local time) as datetime64[D], without building date objects per bar
+        bar_dates = hist.index.tz_localize(None).to_numpy().astype('datetime64[D]')
+        
         for period, start_date in periods.items():
-            try:
-                # Get historical price
-                hist = stock.history(start=start_date, end=end_date, interval="1d")
-                if not hist.empty:
-                    start_price = hist['Close'].iloc[0]
-                    performance[period] = ((current_price / start_price) - 1)
-                else:
-                    performance[period] = 0.0
-            except Exception as e:
+            # First session on or after the start of the period
+            start_index = np.searchsorted(bar_dates, np.datetime64(start_date.date(), 'D'))
+            if start_index < len(closes):
+                performance[period] = ((current_price / closes[start_index]) - 1)
+            else:
                 performance[period] = 0.0
         
-        # Calculate daily performance separately using previous close
-        try:
-            hist = stock.history(period="2d")
-            if len(hist) >= 2:
-                prev_close = hist['Close'].iloc[-2]
-                performance['1d'] = ((current_price / prev_close) - 1)
-        except Exception as e:
+        # Calculate daily performance using previous close
+        if len(closes) >= 2:
+            performance['1d'] = ((current_price / closes[-2]) - 1)
+        else:
             performance['1d'] = 0.0
         
         return performance
@@ -595,24 +741,16 @@ def financial_health_chart(ticker):
             if pd.isna(value): return 0.0
             return round(value / 1e6, 1)
 
-        periods = []
+        if is_annual:
+            periods = [f"FY{idx.year}" for idx in financial_data.index]
+        else:
+            periods = [f"{idx.year}-{'H1' if idx.month <= 6 else 'H2'}" for idx in financial_data.index]
+
+        # Pull each column out once instead of building a row Series per period
         formatted_data = {
-            "Total Debt": [],
-            "Free Cash Flow": [],
-            "Cash and Equivalents": []
+            column: [format_value(value) for value in financial_data[column].tolist()]
+            for column in ("Total Debt", "Free Cash Flow", "Cash and Equivalents")
         }
-        
-        for idx, row in financial_data.iterrows():
-            if is_annual:
-                period_label = f"FY{idx.year}"
-            else:
-                half = 'H1' if idx.month <= 6 else 'H2'
-                period_label = f"{idx.year}-{half}"
-            
-            periods.append(period_label)
-            formatted_data["Total Debt"].append(format_value(row['Total Debt']))
-            formatted_data["Free Cash Flow"].append(format_value(row['Free Cash Flow']))
-            formatted_data["Cash and Equivalents"].append(format_value(row['Cash and Equivalents']))
 
         # --- 4. Final Data Structure ---
         chart_data = {
@@ -710,8 +848,9 @@ def get_dividend_history_chart(ticker):
             log_error(f"No price history available for {ticker}", "DIVIDEND_HISTORY_CHART")
             return {}
         
-        # Resample to annual closing prices using new frequency convention
-        annual_prices = history['Close'].resample('YE').last()
+        # Resample to annual closing prices using new frequency convention and
+        # look them up directly on the dividend years (no union/outer alignment needed)
+        annual_prices = history['Close'].resample('YE').last().reindex(annual_dividends.index)
         
         # Align dividend and price data
         aligned_data = pd.DataFrame({
@@ -720,7 +859,7 @@ def get_dividend_history_chart(ticker):
         }).dropna()
         
         # Calculate dividend yield (dividend / price * 100) and round to 2 decimals
-        aligned_data['yield'] = ((aligned_data['dividend'] / aligned_data['price']) * 100).round(2)
+        dividend_yield = ((aligned_data['dividend'] / aligned_data['price']) * 100).round(2)
         
         # Generate year labels
         years = [str(idx.year) for idx in aligned_data.index]
@@ -757,7 +896,7 @@ def get_dividend_history_chart(ticker):
                         "name": "Dividend Yield",
                         "type": "line",
                         "yAxisId": "yieldAxis",
-                        "data": aligned_data['yield'].tolist()
+                        "data": dividend_yield.tolist()
                     }
                 ]
             }
@@ -1,14 +1,20 @@
 
+import time
 import yfinance as yf
 import numpy as np
 from logging_utils import log_error, log_info
+from _config import MONTE_CARLO_MODEL_LOOKBACK_DAYS
 
-# Defines the default time horizon for the model
-MONTE_CARLO_MODEL_TIME_HORIZON = 252 
+# Close prices are reused within this window so that volatility and drift for the
+# same ticker are computed from a single Yahoo Finance request
+CLOSE_PRICES_CACHE_TTL_SECONDS = 300
+CLOSE_PRICES_CACHE_MAX_ENTRIES = 128
+_close_prices_cache = {}
 
 def get_close_prices(ticker, days=90):
     """
     Collects the last 'days' of close prices for a given ticker from Yahoo Finance.
+    A recent download of the same ticker and window is reused when available.
 
     Args:
       ticker: The stock ticker symbol.
@@ -18,16 +24,42 @@ def get_close_prices(ticker, days=90):
       A pandas Series of close prices, or None if an error occurs.
     """
     try:
+        key = (str(ticker), days)
+        now = time.time()
+        cached = _close_prices_cache.get(key)
+        if cached is not None and now - cached[0] < CLOSE_PRICES_CACHE_TTL_SECONDS:
+            return cached[1]
+
         log_info(f"Fetching {days} days of close prices for {ticker}...")
         stock = yf.Ticker(ticker)
         hist = stock.history(period=f"{days}d")
         log_info(f"Successfully fetched data for {ticker}.")
-        return hist['Close']
+        close_prices = hist['Close']
+
+        if not close_prices.empty:
+            if len(_close_prices_cache) >= CLOSE_PRICES_CACHE_MAX_ENTRIES:
+                _close_prices_cache.clear()
+            _close_prices_cache[key] = (now, close_prices)
+        return close_prices
     except Exception as e:
         log_error(f"Error fetching data for {ticker}", "DATA_FETCH", e)
         return None
 
-def calculate_volatility(ticker, days=MONTE_CARLO_MODEL_TIME_HORIZON):
+def _daily_log_returns(close_prices):
+    """
+    Computes daily log returns straight from the close price array, dropping NaN.
+
+    Args:
+      close_prices: A pandas Series of close prices.
+
+    Returns:
+      A NumPy array of daily log returns.
+    """
+    prices = close_prices.to_numpy(dtype=float)
+    log_returns = np.log(prices[1:] / prices[:-1])
+    return log_returns[~np.isnan(log_returns)]
+
+def calculate_volatility(ticker, days=MONTE_CARLO_MODEL_LOOKBACK_DAYS):
     """
     Calculates the annualized volatility (sigma) of a series of close prices for a given ticker.
 
@@ -47,10 +79,10 @@ def calculate_volatility(ticker, days=MONTE_CARLO_MODEL_TIME_HORIZON):
             return 0.3
 
         # 1. Calculate Daily Log Returns and drop NaN
-        log_returns = np.log(close_prices / close_prices.shift(1)).dropna()
+        log_returns = _daily_log_returns(close_prices)
 
-        # 2. Calculate Daily Volatility
-        daily_volatility = log_returns.std()
+        # 2. Calculate Daily Volatility (sample standard deviation, as pandas computes it)
+        daily_volatility = log_returns.std(ddof=1)
 
         # 3. Annualize
         annualized_volatility = daily_volatility * np.sqrt(252)
@@ -64,7 +96,7 @@ def calculate_volatility(ticker, days=MONTE_CARLO_MODEL_TIME_HORIZON):
         log_error(f"Error calculating volatility for {ticker}, defaulting to 0.3", "CALCULATION", e)
         return 0.3
 
-def calculate_drift(ticker, days=MONTE_CARLO_MODEL_TIME_HORIZON):
+def calculate_drift(ticker, days=MONTE_CARLO_MODEL_LOOKBACK_DAYS):
     """
     Calculates the annualized drift (mu) from log returns for use in a
     Geometric Brownian Motion Monte Carlo simulation.
@@ -85,7 +117,7 @@ def calculate_drift(ticker, days=MONTE_CARLO_MODEL_TIME_HORIZON):
             return 0.0
 
         # 1. Daily log returns
-        log_returns = np.log(close_prices / close_prices.shift(1)).dropna()
+        log_returns = _daily_log_returns(close_prices)
 
         # 2. Estimate daily drift from log returns
         daily_drift = log_returns.mean()
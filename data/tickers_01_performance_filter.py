@@ -63,15 +63,17 @@ def _calculate_performance(df: pd.DataFrame, days: int) -> Optional[float]:
     # Target date is ~days ago
     target_date = df.index[-1] - pd.Timedelta(days=days)
     
-    # Find the closest date in the index that is <= target_date
-    idx = df.index.asof(target_date)
+    # Find the position of the closest date in the index that is <= target_date
+    pos = df.index.searchsorted(target_date, side="right") - 1
     
-    if pd.isna(idx):
+    if pos < 0:
         # If target_date is before the first date in df, it means we don't have enough history
         return None
 
-    initial_price = df.loc[idx, "Close"]
-    final_price = df.iloc[-1]["Close"]
+    # Read both prices from the raw Close array instead of building a row Series
+    close = df["Close"].to_numpy()
+    initial_price = close[pos]
+    final_price = close[-1]
 
     if initial_price == 0 or pd.isna(initial_price) or pd.isna(final_price):
         return None
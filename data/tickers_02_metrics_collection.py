@@ -313,28 +313,17 @@ def _calculate_30d_average_daily_range_in_pips(ticker_symbol: str, history_df: p
         # Get the last 30 trading days
         ticker_data = history_df.tail(30)
 
-        daily_ranges_in_pips = []
         is_jpy_pair = "JPY" in ticker_symbol.upper()
 
-        for index, row in ticker_data.iterrows():
-            high = row["High"]
-            low = row["Low"]
-            daily_range = high - low
+        # Convert to pips
+        # For JPY pairs, 1 pip is 0.01; for most other pairs, 1 pip is 0.0001
+        pip_multiplier = 100 if is_jpy_pair else 10000
 
-            # Convert to pips
-            if is_jpy_pair:
-                # For JPY pairs, 1 pip is 0.01
-                daily_range_pips = daily_range * 100
-            else:
-                # For most other pairs, 1 pip is 0.0001
-                daily_range_pips = daily_range * 10000
-            
-            daily_ranges_in_pips.append(daily_range_pips)
-
-        if not daily_ranges_in_pips:
+        daily_ranges = ticker_data["High"].to_numpy(dtype=float) - ticker_data["Low"].to_numpy(dtype=float)
+        if daily_ranges.size == 0:
             return None
 
-        average_daily_range_pips = sum(daily_ranges_in_pips) / len(daily_ranges_in_pips)
+        average_daily_range_pips = float(daily_ranges.mean()) * pip_multiplier
         log_info(f"Calculated 30-day average daily range for {ticker_symbol}: {average_daily_range_pips:.2f} pips.")
         return round(average_daily_range_pips, 2)
 
@@ -368,15 +357,22 @@ def _calculate_momentum_spread(ticker_symbol: str, history_df: pd.DataFrame) ->
 
         ticker_data = history_df
 
-        close = ticker_data["Close"]
-        high = ticker_data["High"]
-        low = ticker_data["Low"]
+        close = ticker_data["Close"].to_numpy(dtype=float)
+        high = ticker_data["High"].to_numpy(dtype=float)
+        low = ticker_data["Low"].to_numpy(dtype=float)
 
-        # 1M Momentum (%)
-        momentum = close.pct_change(lookback_momentum).iloc[-1] * 100
-
-        # Average daily range as % of price (spread proxy)
-        range_pct = ((high - low) / close).rolling(lookback_range).mean().iloc[-1] * 100
+        # 1M Momentum (%), from the two prices it depends on rather than a full pct_change series
+        if len(close) > lookback_momentum:
+            momentum = (close[-1] / close[-1 - lookback_momentum] - 1) * 100
+        else:
+            momentum = np.nan
+
+        # Average daily range as % of price (spread proxy), over the last window only.
+        # np.mean propagates NaN exactly like the last value of a full rolling mean would.
+        recent_high = high[-lookback_range:]
+        recent_low = low[-lookback_range:]
+        recent_close = close[-lookback_range:]
+        range_pct = np.mean((recent_high - recent_low) / recent_close) * 100
 
         # Avoid divide-by-zero
         if range_pct == 0:
@@ -46,7 +46,7 @@ def insert_commodities_asset(db):
         
         # Check if any commodity instruments already exist in the 'tickers' collection
         # (Commodities are categorized as EN, ME, or AG)
-        if tickers_collection.count_documents({"asset_class": {"$in": ["EN", "ME", "AG"]}}) > 0:
+        if tickers_collection.count_documents({"asset_class": {"$in": ["EN", "ME", "AG"]}}, limit=1) > 0:
             log_info(f"The '{collection_name}' collection already contains commodity assets (EN, ME, or AG). Skipping insertion.")
             return True
 
@@ -76,7 +76,7 @@ def insert_commodities_asset(db):
                 continue
                 
             # Check if already exists in tickers collection to avoid duplicates
-            if tickers_collection.count_documents({"ticker": ticker}) > 0:
+            if tickers_collection.count_documents({"ticker": ticker}, limit=1) > 0:
                 continue
                 
             symbol_full = doc.get('SymbolFull', '').lower()
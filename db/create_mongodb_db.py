@@ -331,7 +331,13 @@ def create_tickers_collection(db):
                 },
                 'document_generated':{
                     'bsonType': 'bool',
-                }                
+                },
+                'last_processed': {
+                    'bsonType': 'date',
+                },
+                'claimed_at': {
+                    'bsonType': 'date',
+                }
             }
         }
     }
@@ -954,6 +960,9 @@ def create_pipeline_collection(db):
                 },
                 'task_completed': {
                     'bsonType': 'bool'
+                },
+                'claimed_at': {
+                    'bsonType': 'date'
                 }
             }
         }
@@ -973,6 +982,51 @@ def create_pipeline_collection(db):
     return success
 
 
+def create_poll_indexes(db):
+    """
+    Creates the partial indexes backing the batch runner's pending-task polls.
+    Unlike the collection indexes, these are also added to existing collections;
+    creating an index that already exists is a no-op.
+    
+    Args:
+        db: MongoDB database object
+        
+    Returns:
+        bool: True if the indexes were created or already exist, False on error
+    """
+    print()
+    print("=" * 100)
+    print("Creating batch polling indexes...")
+    print("=" * 100)
+    print()
+
+    # Only pending documents are indexed, so the indexes stay small as completed tasks accumulate
+    poll_indexes = {
+        'tickers': pymongo.IndexModel(
+            [('document_generated', pymongo.ASCENDING), ('last_processed', pymongo.ASCENDING)],
+            name='pending_poll_idx',
+            partialFilterExpression={'document_generated': False}
+        ),
+        'pipeline': pymongo.IndexModel(
+            [('task_completed', pymongo.ASCENDING), ('claimed_at', pymongo.ASCENDING)],
+            name='pending_poll_idx',
+            partialFilterExpression={'task_completed': False}
+        )
+    }
+
+    try:
+        for collection_name, index in poll_indexes.items():
+            db[collection_name].create_indexes([index])
+            print(f"Index 'pending_poll_idx' ready on '{collection_name}'")
+        return True
+    except pymongo.errors.OperationFailure as e:
+        log_error("MongoDB operation failed while creating polling indexes", "MONGODB_OPERATION", e)
+        return False
+    except Exception as e:
+        log_error("Unexpected error creating polling indexes", "INDEX_CREATION", e)
+        return False
+
+
 def create_regions_collection(db):
     """
     Creates the 'regions' collection with schema validation.
@@ -1119,6 +1173,7 @@ def create_alphasentra_database():
             create_tickers_collection,
             create_trades_collection,
             create_pipeline_collection,
+            create_poll_indexes,
             create_asset_classes_collection,
             create_settings_collection,
             create_users_collection,
@@ -37,7 +37,7 @@ def insert_crypto_assets(db):
         tickers_collection = db[collection_name]
         
         # Check if any CR instruments already exist in the 'tickers' collection
-        if tickers_collection.count_documents({"asset_class": "CR"}) > 0:
+        if tickers_collection.count_documents({"asset_class": "CR"}, limit=1) > 0:
             log_info(f"The '{collection_name}' collection already contains 'CR' (Crypto) assets. Skipping insertion.")
             return True
 
@@ -67,7 +67,7 @@ def insert_crypto_assets(db):
                 continue
                 
             # Check if already exists in tickers collection to avoid duplicates
-            if tickers_collection.count_documents({"ticker": ticker}) > 0:
+            if tickers_collection.count_documents({"ticker": ticker}, limit=1) > 0:
                 continue
             
             log_info(f"Mapping eToro ticker '{ticker}' for crypto asset")
@@ -39,7 +39,7 @@ def insert_equities(db):
         regions_collection = db['regions']
         
         # Check if any EQ or ETF instruments already exist in the 'tickers' collection
-        if tickers_collection.count_documents({"asset_class": {"$in": ["EQ", "ETF"]}}) > 0:
+        if tickers_collection.count_documents({"asset_class": {"$in": ["EQ", "ETF"]}}, limit=1) > 0:
             log_info(f"The '{collection_name}' collection already contains 'EQ' or 'ETF' assets. Skipping insertion.")
             return True
 
@@ -77,7 +77,7 @@ def insert_equities(db):
                 continue
                 
             # Check if already exists in tickers collection to avoid duplicates
-            if tickers_collection.count_documents({"ticker_etoro": ticker}) > 0:
+            if tickers_collection.count_documents({"ticker_etoro": ticker}, limit=1) > 0:
                 continue
                 
             # Map fields to match the desired structure
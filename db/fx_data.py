@@ -37,7 +37,7 @@ def insert_fx_pairs(db):
         tickers_collection = db[collection_name]
         
         # Check if any FX instruments already exist in the 'tickers' collection
-        if tickers_collection.count_documents({"asset_class": "FX"}) > 0:
+        if tickers_collection.count_documents({"asset_class": "FX"}, limit=1) > 0:
             log_info(f"The '{collection_name}' collection already contains 'FX' assets. Skipping insertion.")
             return True
 
@@ -67,7 +67,7 @@ def insert_fx_pairs(db):
                 continue
                 
             # Check if already exists in tickers collection to avoid duplicates
-            if tickers_collection.count_documents({"ticker_etoro": ticker}) > 0:
+            if tickers_collection.count_documents({"ticker_etoro": ticker}, limit=1) > 0:
                 continue
                 
             # Map fields to match the desired structure
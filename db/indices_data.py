@@ -44,7 +44,7 @@ def insert_indices(db):
         collection = db[collection_name]
         
         # Check if any indices already exist to avoid duplicates
-        if collection.count_documents({"asset_class": {"$regex": "IX"}}) > 0:
+        if collection.count_documents({"asset_class": {"$regex": "IX"}}, limit=1) > 0:
             print(f"The '{collection_name}' collection already contains 'IX' (Index) assets. Skipping insertion.")
             return True
         
@@ -9,7 +9,10 @@ import os
 from dotenv import load_dotenv
 import sys
 import re
+import json
 import time
+from datetime import datetime, timezone, date
+from concurrent.futures import ThreadPoolExecutor
 
 # MongoDB imports - handle optional dependency
 try:
@@ -33,6 +36,9 @@ from _config import AI_RESPONSE_MAX_RETRIES, AI_PAUSE_BETWEEN_RETRIES_IN_SECONDS
 # Load environment variables
 load_dotenv()
 
+# Maximum number of concurrent current-price lookups for a set of recommendations
+CURRENT_PRICE_LOOKUP_THREADS = 8
+
 def get_trade_recommendations(tickers_with_direction, decimal_digits=2):
     """
     Return trade recommendations including stop loss and target prices in the specified JSON format.
@@ -192,12 +198,14 @@ def add_entry_price_to_recommendations(recommendations, gemini_model=None, decim
             if ticker and ticker not in all_tickers:
                 all_tickers.append(ticker)
         
-        # Get current prices for all tickers
+        # Get current prices for all tickers (independent requests, so fetch them concurrently)
         current_prices = {}
-        for ticker in all_tickers:
-            current_price = get_current_price(ticker)
-            if current_price is not None:
-                current_prices[ticker] = round(current_price, decimal_digits)
+        if all_tickers:
+            with ThreadPoolExecutor(max_workers=min(CURRENT_PRICE_LOOKUP_THREADS, len(all_tickers))) as executor:
+                fetched_prices = list(executor.map(get_current_price, all_tickers))
+            for ticker, current_price in zip(all_tickers, fetched_prices):
+                if current_price is not None:
+                    current_prices[ticker] = round(current_price, decimal_digits)
         
         # Group tickers by trade direction
         long_tickers = []
@@ -266,7 +274,6 @@ def strip_markdown_code_blocks(text):
     Handles various formats including ```json, ```, and variations with whitespace.
     Also extracts JSON content from the end of response strings when markdown formatting is incomplete.
     """
-    import re
     
     if not isinstance(text, str):
         return text
@@ -307,9 +314,6 @@ def extract_json_from_text(text):
     Handles various JSON formats and validates the extracted content.
     Includes JSON repair capabilities for common AI response issues.
     """
-    import re
-    import json
-    from logging_utils import log_warning, log_error
     
     if not isinstance(text, str) or not text.strip():
         log_warning("Empty or non-string text provided to extract_json_from_text", "JSON_EXTRACTION")
@@ -425,7 +429,6 @@ def validate_json_structure(json_content):
     Returns:
     bool: True if structure appears valid, False otherwise
     """
-    import re
     
     if not json_content or not isinstance(json_content, str):
         return False
@@ -472,9 +475,6 @@ def repair_json_content(json_content, error_message=""):
     Returns:
     str: Repaired JSON content if successful, None if repair fails
     """
-    import re
-    import json
-    from logging_utils import log_warning, log_error
     
     if not json_content:
         return None
@@ -655,8 +655,6 @@ def get_current_gmt_timestamp():
     Returns:
     str: Current timestamp in ISO 8601 format with GMT timezone
     """
-    from datetime import datetime, timezone
-    
     # Get current UTC time
     current_utc = datetime.now(timezone.utc)
     
@@ -734,6 +732,14 @@ class DatabaseManager:
             self._client = None
             log_info("MongoDB connection closed")
 
+    def reset_client(self):
+        """
+        Drop the current MongoDB client without closing it, so the next get_client()
+        call opens a fresh one. Used by forked worker processes, which must not reuse
+        connections inherited from the parent.
+        """
+        self._client = None
+
 
 def update_ticker_fail_status(ticker: str) -> None:
     """
@@ -837,12 +843,10 @@ def check_pending_ticker_documents() -> bool:
         client = DatabaseManager().get_client()
         db = client[os.getenv("MONGODB_DATABASE", "alphasentra-core")]
         
-        # Query for documents where document_generated is not True
-        has_pending = db.tickers.count_documents(
-            {"document_generated": {"$ne": True}}
-        ) > 0
-        log_info(f"Number of pending ticker to process: {db.tickers.count_documents({'document_generated': {'$ne': True}})}")
-        return has_pending
+        # Query for documents where document_generated is not True (counted once, reused for the log)
+        pending_count = db.tickers.count_documents({"document_generated": {"$ne": True}})
+        log_info(f"Number of pending ticker to process: {pending_count}")
+        return pending_count > 0
         
     except Exception as e:
         log_error("Error checking ticker documents status", "DATA_FETCH", e)
@@ -1069,12 +1073,8 @@ def get_ai_weights(tickers, factor_weights_prompt, weights_percent, model_name=N
     Returns:
     dict: AI-generated weights or None if error occurs
     """
-    import os
     from crypt import decrypt_string
     from genAI.ai_prompt import get_gen_ai_response
-    from logging_utils import log_error, log_warning
-    import json
-    from datetime import datetime, date
     
     # First check if we have cached weights for today in MongoDB
     try:
@@ -1373,7 +1373,6 @@ def get_factors(tickers, name=None, current_date=None, prompt=None, batch_mode=F
     """
     from crypt import decrypt_string
     from genAI.ai_prompt import get_gen_ai_response
-    import json
     
     try:        
         # Decrypt the prompt if it's encrypted
@@ -1402,7 +1401,6 @@ def get_factors(tickers, name=None, current_date=None, prompt=None, batch_mode=F
         max_retries = AI_RESPONSE_MAX_RETRIES
         retry_count = 0
         parse_success = False
-        import time
 
         log_info("Starting factors analysis AI response retrieval")
 
@@ -4,6 +4,7 @@ import datetime
 import re
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from genAI.ai_prompt import get_gen_ai_response
 from _config import INSTRUMENT_DESCRIPTION_PROMPT, AI_RESPONSE_MAX_RETRIES, AI_PAUSE_BETWEEN_RETRIES_IN_SECONDS
 from crypt import decrypt_string
@@ -115,43 +116,39 @@ def run_analysis(ticker, instrument_name, batch_mode=False):
     
     def process_equity_charts(ticker):
         """Process charts specifically for equity asset class"""
+        chart_functions = {
+            "growth_profitability": ("growth_profitability_chart", get_growth_profitability_chart),
+            "financial_health": ("financial_health_chart", financial_health_chart),
+            "capital_structure": ("capital_structure_chart", get_capital_structure_chart),
+            "dividend_history": ("dividend_history_chart", get_dividend_history_chart)
+        }
         
-        def extract_chart(chart_key):
-            chart_functions = {
-                "growth_profitability_chart": get_growth_profitability_chart,
-                "financial_health_chart": financial_health_chart,
-                "capital_structure_chart": get_capital_structure_chart,
-                "dividend_history_chart": get_dividend_history_chart
-            }
-            
-            if chart_key not in chart_functions:
-                return {
+        # Get asset classes and check if any is 'EQ'
+        ticker_to_check = ticker[0] if isinstance(ticker, list) else ticker
+        asset_classes = get_asset_classes(ticker_to_check)
+        if 'EQ' not in asset_classes:
+            return {
+                name: {
                     "title": "",
                     "xAxis": {},
                     "yAxis": {},
                     "series": []
                 }
-            
-            # Get asset classes and check if any is 'EQ'
-            ticker_to_check = ticker[0] if isinstance(ticker, list) else ticker
-            asset_classes = get_asset_classes(ticker_to_check)
-            if 'EQ' not in asset_classes:
-                return {
-                    "title": "",
-                    "xAxis": {},
-                    "yAxis": {},
-                    "series": []
-                }
-            
-            chart_data = chart_functions[chart_key](ticker_to_check)
-            return chart_data.get(chart_key, {}) if chart_data is not None else {}
+                for name in chart_functions
+            }
         
-        return {
-            "growth_profitability": extract_chart("growth_profitability_chart"),
-            "financial_health": extract_chart("financial_health_chart"),
-            "capital_structure": extract_chart("capital_structure_chart"),
-            "dividend_history": extract_chart("dividend_history_chart")
-        }
+        # Each chart makes its own independent Yahoo Finance requests, so fetch them concurrently
+        with ThreadPoolExecutor(max_workers=len(chart_functions)) as executor:
+            futures = {
+                name: (chart_key, executor.submit(chart_function, ticker_to_check))
+                for name, (chart_key, chart_function) in chart_functions.items()
+            }
+        
+        charts = {}
+        for name, (chart_key, future) in futures.items():
+            chart_data = future.result()
+            charts[name] = chart_data.get(chart_key, {}) if chart_data is not None else {}
+        return charts
     
     # Process equity charts
     charts = process_equity_charts(ticker)
@@ -29,6 +29,39 @@ import random
 import pymongo
 from helpers import DatabaseManager
 from logging_utils import log_error, log_info, log_warning
+from _config import MONTE_CARLO_MODEL_INITIAL_BET_SIZE, MONTE_CARLO_MODEL_TIME_HORIZON
+
+# Supported strategy directions, in the order the optimizer evaluates them
+STRATEGY_DIRECTIONS = ("long", "short")
+VALID_STRATEGY_DIRECTIONS = frozenset(STRATEGY_DIRECTIONS)
+# Sign applied to price moves to express them as trade profit/loss
+DIRECTION_SIGNS = {"long": 1, "short": -1}
+
+def _simulate_price_paths(
+    initial_price: float,
+    volatility: float,
+    drift: float,
+    time_horizon: int,
+    num_simulations: int
+):
+    """
+    Generates a (num_simulations, time_horizon) matrix of geometric Brownian motion price paths.
+    """
+    # Daily drift and volatility
+    daily_drift = drift / 252
+    daily_volatility = volatility / np.sqrt(252)
+
+    # Generate all random daily returns at once, transforming the draw buffer in place
+    price_paths = np.random.normal(0, 1, (num_simulations, time_horizon))
+    price_paths *= daily_volatility
+    price_paths += daily_drift - 0.5 * daily_volatility**2
+    np.exp(price_paths, out=price_paths)
+
+    # Compound the daily returns into price paths without allocating new matrices
+    np.cumprod(price_paths, axis=1, out=price_paths)
+    price_paths *= initial_price
+    return price_paths
+
 
 def _run_simulation_for_optimization(
     initial_price: float,
@@ -38,7 +71,8 @@ def _run_simulation_for_optimization(
     volatility: float,
     drift: float,
     time_horizon: int,
-    num_simulations: int
+    num_simulations: int,
+    price_paths: np.ndarray = None
 ):
     """
     A lightweight and performance-optimized version of the Monte Carlo simulation, designed specifically for the optimization process.
@@ -46,26 +80,21 @@ def _run_simulation_for_optimization(
     This function rapidly calculates the Expected Value (EV) and Win Probability for a given set of trading parameters.
     It is stripped of detailed analytics to allow for quick, iterative testing of numerous
     target and stop-loss combinations in the `optimize_and_run_monte_carlo` function.
+
+    `price_paths` can be supplied to evaluate several parameter sets against the same simulated
+    paths; when omitted, a fresh set is generated.
     """
     strategy_direction = strategy_direction.lower()
-    if strategy_direction not in {"long", "short"}:
+    if strategy_direction not in VALID_STRATEGY_DIRECTIONS:
         raise ValueError(f"Invalid strategy direction: {strategy_direction}")
 
-    # Daily drift and volatility
-    daily_drift = drift / 252
-    daily_volatility = volatility / np.sqrt(252)
+    if price_paths is None:
+        price_paths = _simulate_price_paths(initial_price, volatility, drift, time_horizon, num_simulations)
 
-    # Generate all random daily returns at once using NumPy
-    daily_returns = np.exp(
-        (daily_drift - 0.5 * daily_volatility**2) +
-        daily_volatility * np.random.normal(0, 1, (num_simulations, time_horizon))
-    )
-
-    # Calculate all price paths at once
-    price_paths = initial_price * daily_returns.cumprod(axis=1)
+    direction = DIRECTION_SIGNS[strategy_direction]
 
     # Determine hits for target and stop-loss across all paths
-    if strategy_direction == 'long':
+    if direction > 0:  # long
         target_hits = price_paths >= target_price
         stop_hits = price_paths <= stop_loss
     else:  # short
@@ -83,21 +112,11 @@ def _run_simulation_for_optimization(
     # Create masks for each outcome type
     is_win = valid_target_hit & (~valid_stop_hit | (target_hit_days <= stop_hit_days))
     is_loss = valid_stop_hit & (~valid_target_hit | (stop_hit_days < target_hit_days))
-    is_expired = ~(is_win | is_loss)
-
-    # Initialize outcomes array
-    outcomes = np.zeros(num_simulations)
-    final_prices_expired = price_paths[is_expired, -1]
 
-    # Calculate the outcome (profit/loss) for each simulation path
-    if strategy_direction == 'long':
-        outcomes[is_win] = target_price - initial_price
-        outcomes[is_loss] = stop_loss - initial_price
-        outcomes[is_expired] = final_prices_expired - initial_price
-    else:  # short
-        outcomes[is_win] = initial_price - target_price
-        outcomes[is_loss] = initial_price - stop_loss
-        outcomes[is_expired] = initial_price - final_prices_expired
+    # Calculate the outcome (profit/loss) for each simulation path: the exit price is the
+    # target, the stop, or the final price for expired trades, signed by trade direction
+    exit_prices = np.where(is_win, target_price, np.where(is_loss, stop_loss, price_paths[:, -1]))
+    outcomes = direction * (exit_prices - initial_price)
 
     # Calculate the summary metrics
     expected_value = np.mean(outcomes)
@@ -105,7 +124,6 @@ def _run_simulation_for_optimization(
 
     # Scale expected_value by the initial bet size from config
     # The bet size represents a dollar amount, so we need to calculate how many shares it can buy
-    from _config import MONTE_CARLO_MODEL_INITIAL_BET_SIZE
     shares_from_bet_size = MONTE_CARLO_MODEL_INITIAL_BET_SIZE / initial_price
     scaled_expected_value = expected_value * shares_from_bet_size
 
@@ -219,7 +237,6 @@ def optimize_and_run_monte_carlo(
     rrr_range = np.arange(min_rrr, 3.1, 0.5) # Cap RRR at 3:1
 
     # Use the configured time horizon from _config.py
-    from _config import MONTE_CARLO_MODEL_TIME_HORIZON
     time_horizon = MONTE_CARLO_MODEL_TIME_HORIZON
     log_info(f"Using configured time horizon: {time_horizon} days for {ticker}")
 
@@ -249,40 +266,38 @@ def optimize_and_run_monte_carlo(
 
     # Dynamic search space for stop-loss based on volatility
     daily_volatility = volatility / np.sqrt(252)
+
+    # Every parameter set is scored against the same simulated paths, so generate them only once
+    price_paths = _simulate_price_paths(initial_price, volatility, drift, time_horizon, num_simulations)
     
-    for strategy_direction in ["long", "short"]:
-        for vol_multiplier in vol_multiplier_range:
-            stop_loss_distance = initial_price * daily_volatility * vol_multiplier
-            
-            if strategy_direction == 'long':
-                stop_loss_price = initial_price - stop_loss_distance
-            else: # short
-                stop_loss_price = initial_price + stop_loss_distance
-
-            for rrr in rrr_range:
+    # Precompute the stop-loss distance for every (vol_multiplier, rrr) grid point.
+    # The distance is tripled before each RRR step, cumulatively across the RRR range.
+    # Built in one contiguous buffer: seed the first column, then compound it in place.
+    base_distances = initial_price * daily_volatility * vol_multiplier_range
+    stop_loss_distances = np.full((len(vol_multiplier_range), len(rrr_range)), 3.0)
+    stop_loss_distances[:, 0] *= base_distances
+    np.cumprod(stop_loss_distances, axis=1, out=stop_loss_distances)
+
+    for strategy_direction in STRATEGY_DIRECTIONS:
+        # Stop-loss and target price levels for the whole grid of this direction:
+        # the stop sits against the trade and the target in its favour
+        direction = DIRECTION_SIGNS[strategy_direction]
+        stop_loss_prices = initial_price - direction * stop_loss_distances
+        potential_rewards = np.abs(initial_price - stop_loss_prices) * rrr_range
+        target_prices = initial_price + direction * potential_rewards
+
+        for i in range(len(vol_multiplier_range)):
+            for j, rrr in enumerate(rrr_range):
                 current_iteration += 1
                 print(f"  > Optimizing ({strategy_direction})... {current_iteration}/{total_iterations} ({((current_iteration/total_iterations)*100):.1f}%)  ", end='\r')
 
-                # Triple the distance parameters before calculating target and stop prices
-                stop_loss_distance = stop_loss_distance * 3
-                
-                if strategy_direction == 'long':
-                    stop_loss_price = initial_price - stop_loss_distance
-                else: # short
-                    stop_loss_price = initial_price + stop_loss_distance
-
-                potential_risk = abs(initial_price - stop_loss_price)
-                potential_reward = potential_risk * rrr
-
-                if strategy_direction == 'long':
-                    target_price = initial_price + potential_reward
-                else: # short
-                    target_price = initial_price - potential_reward
+                stop_loss_price = stop_loss_prices[i, j]
+                target_price = target_prices[i, j]
 
                 expected_value, win_probability = _run_simulation_for_optimization(
                     initial_price=initial_price, strategy_direction=strategy_direction, target_price=target_price,
                     stop_loss=stop_loss_price, volatility=volatility, drift=drift,
-                    time_horizon=time_horizon, num_simulations=num_simulations
+                    time_horizon=time_horizon, num_simulations=num_simulations, price_paths=price_paths
                 )
 
                 if strategy_direction == 'long':
@@ -372,7 +387,6 @@ def _generate_simulation_commentary(results: dict, num_simulations: int, strateg
     max_dd = results.get("maximum_drawdown", 0) * 100
     ev = results.get("expected_value", 0)
     
-    from _config import MONTE_CARLO_MODEL_INITIAL_BET_SIZE
     bet_size = MONTE_CARLO_MODEL_INITIAL_BET_SIZE
     
     # Calculate profitability score (0-100)
@@ -452,102 +466,91 @@ def run_monte_carlo_simulation(
     and returns a summary of the simulation's performance metrics.
     """
     strategy = strategy.lower()
-    if strategy not in {"long", "short"}:
+    if strategy not in VALID_STRATEGY_DIRECTIONS:
         raise ValueError(f"Invalid strategy: {strategy}")
         
         
-    daily_drift = drift / 252
-    daily_volatility = volatility / np.sqrt(252)
+    # Simulate every path at once: (num_simulations, time_horizon) prices after the entry day.
+    # A horizon of zero days (or less) simulates no days, so every trade expires at the entry price.
+    simulated_days = max(time_horizon, 0)
+    price_paths = _simulate_price_paths(initial_price, volatility, drift, simulated_days, num_simulations)
 
-    wins = 0
-    losses = 0
-    expired_trades = 0
-    days_to_target = []
-    max_drawdowns = []
-    outcomes = []
-    all_paths = []
-
-    for _ in range(num_simulations):
-        price_path = [initial_price]
-        price = initial_price
-        
-        for day in range(1, time_horizon + 1):
-            daily_return = np.exp(
-                (daily_drift - 0.5 * daily_volatility**2) + 
-                daily_volatility * np.random.normal(0, 1)
-            )
-            price *= daily_return
-            price_path.append(price)
-
-            if strategy == 'long':
-                if target_price is not None and price >= target_price:
-                    wins += 1
-                    days_to_target.append(day)
-                    outcomes.append(target_price - initial_price)
-                    break
-                elif stop_loss is not None and price <= stop_loss:
-                    losses += 1
-                    outcomes.append(stop_loss - initial_price)
-                    break
-            
-            elif strategy == 'short':
-                if target_price is not None and price <= target_price:
-                    wins += 1
-                    days_to_target.append(day)
-                    outcomes.append(initial_price - target_price)
-                    break
-                elif stop_loss is not None and price >= stop_loss:
-                    losses += 1
-                    outcomes.append(initial_price - stop_loss)
-                    break
-        
-        else: # Trade expired
-            expired_trades += 1
-            if strategy == 'long':
-                outcomes.append(price - initial_price)
-            else: # short
-                outcomes.append(initial_price - price)
-        
-        all_paths.append(price_path)
-        
-        sim_max_dd = 0
-        peak = price_path[0]
-        for p in price_path:
-            if p > peak:
-                peak = p
-            drawdown = (peak - p) / peak
-            if drawdown > sim_max_dd:
-                sim_max_dd = drawdown
-        max_drawdowns.append(sim_max_dd)
+    direction = DIRECTION_SIGNS[strategy]
+
+    # Determine hits for target and stop-loss across all paths
+    no_hits = np.zeros(price_paths.shape, dtype=bool)
+    if direction > 0: # long
+        target_hits = price_paths >= target_price if target_price is not None else no_hits
+        stop_hits = price_paths <= stop_loss if stop_loss is not None else no_hits
+    else: # short
+        target_hits = price_paths <= target_price if target_price is not None else no_hits
+        stop_hits = price_paths >= stop_loss if stop_loss is not None else no_hits
+
+    # First day (1-based) on which each level is touched, or 0 if never
+    if simulated_days > 0:
+        target_days = np.where(target_hits.any(axis=1), np.argmax(target_hits, axis=1) + 1, 0)
+        stop_days = np.where(stop_hits.any(axis=1), np.argmax(stop_hits, axis=1) + 1, 0)
+    else:
+        target_days = stop_days = np.zeros(num_simulations, dtype=np.intp)
+
+    # The target is checked before the stop on the same day
+    is_win = (target_days > 0) & ((stop_days == 0) | (target_days <= stop_days))
+    is_loss = ~is_win & (stop_days > 0)
+
+    # Day on which each trade is closed (the horizon end for expired trades)
+    exit_days = np.where(is_win, target_days, np.where(is_loss, stop_days, simulated_days))
+
+    # Profit/loss per simulation: exit at the target, the stop, or the final price for
+    # expired trades, signed by trade direction (missing levels can never be hit)
+    target_level = target_price if target_price is not None else np.nan
+    stop_level = stop_loss if stop_loss is not None else np.nan
+    final_prices = price_paths[:, -1] if simulated_days > 0 else np.full(num_simulations, float(initial_price))
+    exit_levels = np.where(is_win, target_level, np.where(is_loss, stop_level, final_prices))
+    outcomes = direction * (exit_levels - initial_price)
+
+    # Full paths including the entry price, held flat after the exit day, written into one
+    # preallocated buffer instead of stacking and then selecting into further copies
+    padded_paths = np.empty((num_simulations, simulated_days + 1))
+    padded_paths[:, 0] = initial_price
+    padded_paths[:, 1:] = price_paths
+    exit_prices = padded_paths[np.arange(num_simulations), exit_days]
+    np.copyto(
+        padded_paths[:, 1:],
+        exit_prices[:, None],
+        where=np.arange(1, simulated_days + 1) > exit_days[:, None]
+    )
+
+    # Maximum drawdown per path from the running peak (holding flat after exit adds no drawdown).
+    # drawdown = 1 - price / peak, so the worst drawdown comes from the smallest price/peak ratio,
+    # computed inside the peaks buffer to avoid full-size temporaries.
+    peaks = np.maximum.accumulate(padded_paths, axis=1)
+    np.divide(padded_paths, peaks, out=peaks)
+    max_drawdowns = 1.0 - peaks.min(axis=1)
+
+    wins = int(np.count_nonzero(is_win))
+    losses = int(np.count_nonzero(is_loss))
+    expired_trades = num_simulations - wins - losses
 
     win_probability = wins / num_simulations if num_simulations > 0 else 0.0
     risk_of_ruin = losses / num_simulations if num_simulations > 0 else 0.0
     expired_probability = expired_trades / num_simulations if num_simulations > 0 else 0.0
     
-    avg_days_to_target = float(np.mean(days_to_target)) if days_to_target else 0.0
-    maximum_drawdown = float(np.max(max_drawdowns)) if max_drawdowns else 0.0
-    expected_value = float(np.mean(outcomes)) if outcomes else 0.0
+    avg_days_to_target = float(target_days[is_win].mean()) if wins else 0.0
+    maximum_drawdown = float(max_drawdowns.max()) if num_simulations > 0 else 0.0
+    expected_value = float(outcomes.mean()) if num_simulations > 0 else 0.0
     
     time_index = list(range(time_horizon + 1))
-    
-    padded_paths = []
-    for path in all_paths:
-        padded_path = path + [path[-1]] * (time_horizon + 1 - len(path))
-        padded_paths.append(padded_path)
-
-    if padded_paths:
-        p5 = np.percentile(padded_paths, 5, axis=0).tolist()
-        p50 = np.percentile(padded_paths, 50, axis=0).tolist()
-        p95 = np.percentile(padded_paths, 95, axis=0).tolist()
+
+    if num_simulations > 0:
+        # Compute all three percentiles in one pass
+        p5, p50, p95 = np.percentile(padded_paths, [5, 50, 95], axis=0).tolist()
     else:
         p5, p50, p95 = [], [], []
 
+    # Sample paths are stored truncated at the exit day; tolist() yields Python floats
     num_samples = min(100, num_simulations)
-    raw_sample_paths = random.sample(all_paths, num_samples) if num_simulations > 0 else []
-
-    # Ensure all numbers in sample_paths are floats for consistent numerical operations.
-    # This handles cases where 'all_paths' might contain integers or other numeric types.
-    sample_paths = [[float(val) for val in path] for path in raw_sample_paths]
+    sample_indices = random.sample(range(num_simulations), num_samples) if num_simulations > 0 else []
+    sample_paths = [padded_paths[i, :exit_days[i] + 1].tolist() for i in sample_indices]
 
     # Generate simulation commentary
     simulation_commentary = _generate_simulation_commentary(
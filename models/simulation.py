@@ -98,36 +98,32 @@ def update_simulation_with_stochastic(
 
     # === 2. Generate additional synthetic points ===
     if simulation_data:
-        for _ in range(num_additional_points):
-            base_profile = simulation_data[np.random.randint(0, len(simulation_data))]
-            base_name = base_profile['profile'].split('#')[0].strip()
+        # Draw every synthetic point's base profile and noise at once
+        base_indices = np.random.randint(0, len(simulation_data), size=num_additional_points)
+        base_c = np.array([entry['conviction'] for entry in simulation_data], dtype=float)
+        base_s = np.array([entry['sentiment'] for entry in simulation_data], dtype=float)
+        new_c = base_c[base_indices] + np.random.normal(0, extrapolate_c_scale, num_additional_points)
+        new_s = base_s[base_indices] + np.random.normal(0, extrapolate_s_scale, num_additional_points)
+
+        # Apply soft correlation
+        new_s = correlation_strength * new_c + (1 - correlation_strength) * new_s
+
+        # Clip to realistic sentiment/conviction range
+        np.clip(new_c, -1, 1, out=new_c)
+        np.clip(new_s, -1, 1, out=new_s)
+
+        # Determine positions with a single vectorized select
+        new_positions = np.select([new_c > 0, new_c < 0], ["BULLISH", "BEARISH"], default="NEUTRAL")
+
+        base_names = [entry['profile'].split('#')[0].strip() for entry in simulation_data]
+        for base_index, c, s, position in zip(base_indices.tolist(), new_c.tolist(),
+                                              new_s.tolist(), new_positions.tolist()):
             random_id = random.randint(1, 1_000_000)
-            unique_profile_name = f"{base_name} #{random_id}"
-            
-            new_c = apply_stochastic_noise(base_profile['conviction'], extrapolate_c_scale)
-            new_s = apply_stochastic_noise(base_profile['sentiment'], extrapolate_s_scale)
-            
-            # Apply soft correlation
-            new_s = (correlation_strength * new_c +
-                     (1 - correlation_strength) * new_s)
-            
-            # Clip to realistic sentiment/conviction range
-            new_c = float(np.clip(new_c, -1, 1))
-            new_s = float(np.clip(new_s, -1, 1))
-            
-            # Determine position
-            if new_c > 0:
-                new_position = "BULLISH"
-            elif new_c < 0:
-                new_position = "BEARISH"
-            else:
-                new_position = "NEUTRAL"
-
             processed_data.append({
-                "profile": unique_profile_name,
-                "conviction": round(new_c, 4),
-                "sentiment": round(new_s, 4),
-                "position": new_position
+                "profile": f"{base_names[base_index]} #{random_id}",
+                "conviction": round(c, 4),
+                "sentiment": round(s, 4),
+                "position": position
             })
 
     return processed_data